@@ -7,23 +7,45 @@ ProCube - Премиум 3D Кубик Рубика на Python
 Описание: Интерактивная 3D игра Кубик Рубика с красивой графикой и геймификацией
 """
 
+import time
+
+# Момент запуска процесса (для отчета о времени старта)
+STARTUP_START = time.perf_counter()
+
 import pygame
 import math
 import random
 import json
 import os
+import threading
 from datetime import datetime
 from typing import List, Tuple, Dict, Optional
 import sys
 
-# Инициализация Pygame
-pygame.init()
+from procube_math import Vector3, Matrix3, Camera
 
 # Константы игры
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
 FPS = 60
 
+# Размеры шрифтов интерфейса
+FONT_SIZES = {
+    'large': 48,
+    'medium': 32,
+    'small': 24,
+}
+
+# Переменная окружения для отчета о времени запуска по фазам
+STARTUP_REPORT_ENV = 'PROCUBE_STARTUP_REPORT'
+
+# Режимы темпа кадров (переменная окружения PROCUBE_FRAME_PACING)
+FRAME_PACING_ENV = 'PROCUBE_FRAME_PACING'
+PACING_ADAPTIVE = 'adaptive'   # полный FPS только при движении, в покое ждем события
+PACING_UNCAPPED = 'uncapped'   # без ограничения FPS (для замеров)
+PACING_VSYNC = 'vsync'         # синхронизация с обновлением экрана (для замеров)
+PACING_MODES = (PACING_ADAPTIVE, PACING_UNCAPPED, PACING_VSYNC)
+
 # Цвета кубика
 COLORS = {
     'white': (255, 255, 255),
@@ -55,50 +77,93 @@ UI_COLORS = {
     'danger': (255, 68, 68),
 }
 
+# Градиент основного фона: от цвета фона вниз к более глубокому синему
+BACKGROUND_GRADIENT = (
+    UI_COLORS['background'],
+    (UI_COLORS['background'][0] * 0.5, UI_COLORS['background'][1] * 0.7,
+     UI_COLORS['background'][2] + 30),
+)
 
-class Vector3:
-    """3D вектор для математических операций"""
-    
-    def __init__(self, x=0, y=0, z=0):
-        self.x = x
-        self.y = y
-        self.z = z
-    
-    def __add__(self, other):
-        return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
-    
-    def __sub__(self, other):
-        return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
+# Обозначения граней для поворотов
+FACES = ['R', 'L', 'U', 'D', 'F', 'B']
+
+# Нормали сторон кубика (для поворота наклеек вместе с кубиками)
+FACE_NORMALS = {
+    'right': (1, 0, 0),
+    'left': (-1, 0, 0),
+    'top': (0, 1, 0),
+    'bottom': (0, -1, 0),
+    'front': (0, 0, 1),
+    'back': (0, 0, -1),
+}
+FACE_BY_NORMAL = {normal: face for face, normal in FACE_NORMALS.items()}
+
+# Матрицы поворотов слоя на 90 градусов: направление 1 - по часовой, если смотреть с оси
+TURN_MATRICES = {
+    (axis, direction): Matrix3.rotation(axis, -direction * math.pi / 2).rounded()
+    for axis in 'xyz' for direction in (1, -1)
+}
+
+# Куда переходит каждая сторона кубика при этих поворотах
+TURN_FACE_MAPS = {
+    key: {face: FACE_BY_NORMAL[turn.apply(*normal)] for face, normal in FACE_NORMALS.items()}
+    for key, turn in TURN_MATRICES.items()
+}
+
+# Начальное положение камеры (наклон, поворот, крен) в радианах
+CAMERA_START = (0.3, 0.3, 0)
+
+# Выбор наклеек мышью
+STICKER_CELL_SIZE = 32      # размер ячейки сетки индекса, пикселей
+DRAG_TURN_THRESHOLD = 12    # с какого смещения мыши начинается поворот слоя
+
+
+def point_in_polygon(point, polygon):
+    """Проверка попадания точки в многоугольник (метод лучей)"""
+    x, y = point
+    inside = False
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+class StickerIndex:
+    """Пространственный индекс наклеек на экране (равномерная сетка)"""
     
-    def __mul__(self, scalar):
-        return Vector3(self.x * scalar, self.y * scalar, self.z * scalar)
+    def __init__(self, cell_size=STICKER_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.polygons = []
     
-    def rotate_x(self, angle):
-        """Поворот вокруг оси X"""
-        cos_a, sin_a = math.cos(angle), math.sin(angle)
-        return Vector3(
-            self.x,
-            self.y * cos_a - self.z * sin_a,
-            self.y * sin_a + self.z * cos_a
-        )
+    def clear(self):
+        """Очистка индекса перед новым кадром"""
+        self.cells.clear()
+        self.polygons.clear()
     
-    def rotate_y(self, angle):
-        """Поворот вокруг оси Y"""
-        cos_a, sin_a = math.cos(angle), math.sin(angle)
-        return Vector3(
-            self.x * cos_a + self.z * sin_a,
-            self.y,
-            -self.x * sin_a + self.z * cos_a
-        )
+    def add(self, polygon, item):
+        """Добавление многоугольника в порядке отрисовки"""
+        index = len(self.polygons)
+        self.polygons.append((polygon, item))
+        
+        cell = self.cell_size
+        xs = [x for x, _ in polygon]
+        ys = [y for _, y in polygon]
+        for cell_x in range(int(min(xs)) // cell, int(max(xs)) // cell + 1):
+            for cell_y in range(int(min(ys)) // cell, int(max(ys)) // cell + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(index)
     
-    def rotate_z(self, angle):
-        """Поворот вокруг оси Z"""
-        cos_a, sin_a = math.cos(angle), math.sin(angle)
-        return Vector3(
-            self.x * cos_a - self.y * sin_a,
-            self.x * sin_a + self.y * cos_a,
-            self.z
-        )
+    def pick(self, pos):
+        """Верхний (последний нарисованный) элемент под точкой или None"""
+        candidates = self.cells.get((int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size))
+        if candidates:
+            for index in reversed(candidates):
+                polygon, item = self.polygons[index]
+                if point_in_polygon(pos, polygon):
+                    return item
+        return None
 
 
 class Cubelet:
@@ -118,23 +183,21 @@ class Cubelet:
         }
         self.rotation = Vector3(0, 0, 0)
         
-    def get_screen_pos(self, camera_rotation, perspective_scale=400):
+    def get_screen_pos(self, camera, perspective_scale=400):
         """Получить экранные координаты с учетом камеры"""
-        # Применяем поворот камеры
-        pos = Vector3(self.current_pos.x, self.current_pos.y, self.current_pos.z)
-        pos = pos.rotate_x(camera_rotation.x)
-        pos = pos.rotate_y(camera_rotation.y)
-        pos = pos.rotate_z(camera_rotation.z)
+        # Применяем поворот камеры (матрица берется из кеша камеры)
+        pos = self.current_pos
+        x, y, z = camera.matrix.apply(pos.x, pos.y, pos.z)
         
         # Простейшая 3D проекция
-        screen_x = WINDOW_WIDTH // 2 + pos.x * 4
-        screen_y = WINDOW_HEIGHT // 2 - pos.y * 4 - pos.z * 2
+        screen_x = WINDOW_WIDTH // 2 + x * 4
+        screen_y = WINDOW_HEIGHT // 2 - y * 4 - z * 2
         
         return int(screen_x), int(screen_y)
     
-    def draw_face(self, screen, camera_rotation, face_name, color):
+    def draw_face(self, screen, camera, face_name, color):
         """Отрисовка одной грани кубика"""
-        center_x, center_y = self.get_screen_pos(camera_rotation)
+        center_x, center_y = self.get_screen_pos(camera)
         half_size = self.size // 2
         
         # Определяем углы грани
@@ -164,6 +227,7 @@ class Cubelet:
         if corners:
             pygame.draw.polygon(screen, color, corners)
             pygame.draw.polygon(screen, (0, 0, 0), corners, 2)
+        return corners
 
 
 class RubiksCube:
@@ -171,13 +235,15 @@ class RubiksCube:
     
     def __init__(self):
         self.cubelets = []
-        self.camera_rotation = Vector3(0.3, 0.3, 0)
+        self.camera_rotation = Camera(*CAMERA_START)
         self.is_rotating = False
         self.rotation_progress = 0
         self.rotation_axis = None
         self.rotation_layer = None
         self.rotation_direction = 1
         self.animation_speed = 5
+        self.sticker_index = StickerIndex()
+        self.scrambled = False  # сборка засчитывается только после перемешивания
         
         self.create_cube()
         self.color_cube()
@@ -218,31 +284,30 @@ class RubiksCube:
         if self.is_rotating:
             return
         
-        self.is_rotating = True
-        self.rotation_progress = 0
-        self.rotation_direction = 1 if clockwise else -1
-        
+        direction = 1 if clockwise else -1
         if face == 'R':
-            self.rotation_axis = 'x'
-            self.rotation_layer = max(c.current_pos.x for c in self.cubelets)
+            self.rotate_layer('x', max(c.current_pos.x for c in self.cubelets), direction)
         elif face == 'L':
-            self.rotation_axis = 'x'
-            self.rotation_layer = min(c.current_pos.x for c in self.cubelets)
-            self.rotation_direction *= -1
+            self.rotate_layer('x', min(c.current_pos.x for c in self.cubelets), -direction)
         elif face == 'U':
-            self.rotation_axis = 'y'
-            self.rotation_layer = max(c.current_pos.y for c in self.cubelets)
+            self.rotate_layer('y', max(c.current_pos.y for c in self.cubelets), direction)
         elif face == 'D':
-            self.rotation_axis = 'y'
-            self.rotation_layer = min(c.current_pos.y for c in self.cubelets)
-            self.rotation_direction *= -1
+            self.rotate_layer('y', min(c.current_pos.y for c in self.cubelets), -direction)
         elif face == 'F':
-            self.rotation_axis = 'z'
-            self.rotation_layer = max(c.current_pos.z for c in self.cubelets)
+            self.rotate_layer('z', max(c.current_pos.z for c in self.cubelets), direction)
         elif face == 'B':
-            self.rotation_axis = 'z'
-            self.rotation_layer = min(c.current_pos.z for c in self.cubelets)
-            self.rotation_direction *= -1
+            self.rotate_layer('z', min(c.current_pos.z for c in self.cubelets), -direction)
+    
+    def rotate_layer(self, axis, layer, direction):
+        """Поворот любого слоя: ось, координата слоя и направление (1 - по часовой)"""
+        if self.is_rotating:
+            return
+        
+        self.is_rotating = True
+        self.rotation_progress = 0
+        self.rotation_axis = axis
+        self.rotation_layer = layer
+        self.rotation_direction = direction
     
     def update_rotation(self):
         """Обновление анимации поворота"""
@@ -258,64 +323,124 @@ class RubiksCube:
     
     def complete_rotation(self):
         """Завершение поворота - обновление позиций кубиков"""
-        affected_cubelets = []
+        key = (self.rotation_axis, 1 if self.rotation_direction > 0 else -1)
+        turn = TURN_MATRICES.get(key)
+        if turn is None:
+            return
+        face_map = TURN_FACE_MAPS[key]
         
-        for cubelet in self.cubelets:
-            if self.rotation_axis == 'x' and abs(cubelet.current_pos.x - self.rotation_layer) < 10:
-                affected_cubelets.append(cubelet)
-            elif self.rotation_axis == 'y' and abs(cubelet.current_pos.y - self.rotation_layer) < 10:
-                affected_cubelets.append(cubelet)
-            elif self.rotation_axis == 'z' and abs(cubelet.current_pos.z - self.rotation_layer) < 10:
-                affected_cubelets.append(cubelet)
-        
-        # Обновляем позиции кубиков после поворота
+        axis, layer = self.rotation_axis, self.rotation_layer
+        affected_cubelets = [
+            cubelet for cubelet in self.cubelets
+            if abs(getattr(cubelet.current_pos, axis) - layer) < 10
+        ]
+        
+        # Обновляем позиции кубиков на месте и поворачиваем наклейки
         for cubelet in affected_cubelets:
-            if self.rotation_axis == 'x':
-                old_y, old_z = cubelet.current_pos.y, cubelet.current_pos.z
-                if self.rotation_direction > 0:
-                    cubelet.current_pos.y = old_z
-                    cubelet.current_pos.z = -old_y
-                else:
-                    cubelet.current_pos.y = -old_z
-                    cubelet.current_pos.z = old_y
-            elif self.rotation_axis == 'y':
-                old_x, old_z = cubelet.current_pos.x, cubelet.current_pos.z
-                if self.rotation_direction > 0:
-                    cubelet.current_pos.x = -old_z
-                    cubelet.current_pos.z = old_x
-                else:
-                    cubelet.current_pos.x = old_z
-                    cubelet.current_pos.z = -old_x
-            elif self.rotation_axis == 'z':
-                old_x, old_y = cubelet.current_pos.x, cubelet.current_pos.y
-                if self.rotation_direction > 0:
-                    cubelet.current_pos.x = old_y
-                    cubelet.current_pos.y = -old_x
-                else:
-                    cubelet.current_pos.x = -old_y
-                    cubelet.current_pos.y = old_x
-    
-    def shuffle(self, moves=25):
-        """Перемешивание кубика"""
-        faces = ['R', 'L', 'U', 'D', 'F', 'B']
+            turn.transform(cubelet.current_pos)
+            cubelet.colors = {face_map[face]: color for face, color in cubelet.colors.items()}
+    
+    def apply_move(self, face, clockwise=True):
+        """Мгновенный поворот грани без анимации"""
+        self.rotate_face(face, clockwise)
+        if self.is_rotating:
+            self.complete_rotation()
+            self.is_rotating = False
+    
+    def shuffle(self, moves=25, rng=None):
+        """Перемешивание кубика, возвращает список сделанных ходов"""
+        rng = rng or random
+        scramble = []
         for _ in range(moves):
-            face = random.choice(faces)
-            clockwise = random.choice([True, False])
-            self.rotate_face(face, clockwise)
+            face = rng.choice(FACES)
+            clockwise = rng.choice([True, False])
             # Мгновенно применяем поворот для перемешивания
-            if self.is_rotating:
-                self.complete_rotation()
-                self.is_rotating = False
+            self.apply_move(face, clockwise)
+            scramble.append((face, clockwise))
+        self.scrambled = True
+        return scramble
+    
+    def load_state(self, other):
+        """Скопировать расположение и наклейки кубиков из другого кубика"""
+        for cubelet, source in zip(self.cubelets, other.cubelets):
+            pos = source.current_pos
+            cubelet.current_pos.set(pos.x, pos.y, pos.z)
+            cubelet.colors = dict(source.colors)
     
     def reset(self):
         """Сброс кубика в начальное состояние"""
         self.create_cube()
         self.color_cube()
+        self.scrambled = False
     
     def is_solved(self):
-        """Проверка решен ли кубик"""
-        # Упрощенная проверка - просто возвращаем False для демо
-        return False
+        """Проверка решен ли кубик: каждая сторона одного цвета"""
+        for face, (nx, ny, nz) in FACE_NORMALS.items():
+            colors = set()
+            for cubelet in self.cubelets:
+                pos = cubelet.current_pos
+                if pos.x * nx + pos.y * ny + pos.z * nz > 0:
+                    colors.add(cubelet.colors[face])
+            if len(colors) > 1:
+                return False
+        return True
+    
+    def screen_direction(self, x, y, z):
+        """Направление на экране, в которое переходит вектор кубика при текущей камере"""
+        x, y, z = self.camera_rotation.matrix.apply(x, y, z)
+        return x * 4, -y * 4 - z * 2
+    
+    def pick_sticker(self, pos):
+        """Наклейка под курсором: (кубик, сторона) или None"""
+        sticker = self.sticker_index.pick(pos)
+        # Черные внутренние стороны закрывают то, что под ними, но не поворачиваются
+        if sticker and sticker[0].colors[sticker[1]] != COLORS['black']:
+            return sticker
+        return None
+    
+    def drag_turn(self, cubelet, face, drag):
+        """
+        Поворот слоя перетаскиванием наклейки.
+        
+        Args:
+            cubelet: Кубик, за наклейку которого тянут
+            face: Сторона наклейки ('front', 'top', ...)
+            drag: Смещение мыши на экране (dx, dy)
+            
+        Returns:
+            True, если поворот начат
+        """
+        if self.is_rotating:
+            return False
+        
+        # Выбираем направление в плоскости наклейки, ближе всего к движению мыши
+        normal = FACE_NORMALS[face]
+        best_score, best_tangent = None, None
+        for axis in range(3):
+            if normal[axis]:
+                continue
+            for sign in (1, -1):
+                tangent = [0, 0, 0]
+                tangent[axis] = sign
+                screen_x, screen_y = self.screen_direction(*tangent)
+                length = math.hypot(screen_x, screen_y)
+                if length == 0:
+                    continue
+                score = (screen_x * drag[0] + screen_y * drag[1]) / length
+                if best_score is None or score > best_score:
+                    best_score, best_tangent = score, tangent
+        if best_tangent is None:
+            return False
+        
+        # Ось поворота = нормаль x касательная; поворот на +90 градусов вокруг нее
+        nx, ny, nz = normal
+        tx, ty, tz = best_tangent
+        rotation_axis = (ny * tz - nz * ty, nz * tx - nx * tz, nx * ty - ny * tx)
+        index = next(i for i, value in enumerate(rotation_axis) if value)
+        pos = cubelet.current_pos
+        layer = (pos.x, pos.y, pos.z)[index]
+        self.rotate_layer('xyz'[index], layer, -rotation_axis[index])
+        return True
     
     def draw(self, screen):
         """Отрисовка кубика"""
@@ -323,27 +448,31 @@ class RubiksCube:
         cubelets_sorted = sorted(self.cubelets, 
                                key=lambda c: -(c.current_pos.x + c.current_pos.y + c.current_pos.z))
         
+        # Индекс наклеек строится заново каждый кадр из нарисованных многоугольников
+        self.sticker_index.clear()
         for cubelet in cubelets_sorted:
             # Рисуем видимые грани
-            cubelet.draw_face(screen, self.camera_rotation, 'front', cubelet.colors['front'])
-            cubelet.draw_face(screen, self.camera_rotation, 'top', cubelet.colors['top'])
-            cubelet.draw_face(screen, self.camera_rotation, 'right', cubelet.colors['right'])
+            for face in ('front', 'top', 'right'):
+                corners = cubelet.draw_face(screen, self.camera_rotation, face, cubelet.colors[face])
+                if corners:
+                    self.sticker_index.add(corners, (cubelet, face))
 
 
 class GameUI:
     """Пользовательский интерфейс игры"""
     
     def __init__(self):
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 24)
+        # Шрифты и градиенты создаются лениво, при первом использовании
+        self.fonts = {}
+        self.gradients = {}
+        self.saved_data = None
         
-        # Игровые данные
-        self.level = self.load_data('level', 1)
-        self.coins = self.load_data('coins', 0)
+        # Игровые данные (сохраненный прогресс загружает load_progress)
+        self.level = 1
+        self.coins = 0
         self.moves = 0
-        self.best_moves = self.load_data('best_moves', 999)
-        self.best_time = self.load_data('best_time', '00:00')
+        self.best_moves = 999
+        self.best_time = '00:00'
         self.start_time = None
         self.game_time = 0
         
@@ -357,16 +486,46 @@ class GameUI:
         
         self.status_message = "🎮 Добро пожаловать в ProCube!"
     
+    def get_font(self, size):
+        """Шрифт нужного размера (создается один раз)"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+    
+    @property
+    def font_large(self):
+        """Крупный шрифт (заголовки)"""
+        return self.get_font(FONT_SIZES['large'])
+    
+    @property
+    def font_medium(self):
+        """Средний шрифт (панели)"""
+        return self.get_font(FONT_SIZES['medium'])
+    
+    @property
+    def font_small(self):
+        """Мелкий шрифт (текст и кнопки)"""
+        return self.get_font(FONT_SIZES['small'])
+    
+    def load_progress(self):
+        """Загрузка сохраненного прогресса игрока"""
+        self.level = self.load_data('level', 1)
+        self.coins = self.load_data('coins', 0)
+        self.best_moves = self.load_data('best_moves', 999)
+        self.best_time = self.load_data('best_time', '00:00')
+    
     def load_data(self, key, default):
-        """Загрузка данных из файла"""
-        try:
-            if os.path.exists('procube_save.json'):
-                with open('procube_save.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get(key, default)
-        except:
-            pass
-        return default
+        """Загрузка данных из файла (файл читается один раз)"""
+        if self.saved_data is None:
+            self.saved_data = {}
+            try:
+                if os.path.exists('procube_save.json'):
+                    with open('procube_save.json', 'r', encoding='utf-8') as f:
+                        self.saved_data = json.load(f)
+            except:
+                pass
+        return self.saved_data.get(key, default)
     
     def save_data(self):
         """Сохранение данных в файл"""
@@ -385,12 +544,12 @@ class GameUI:
     def start_timer(self):
         """Запуск таймера игры"""
         if not self.start_time:
-            self.start_time = pygame.time.get_ticks()
+            self.start_time = time.monotonic()
     
     def update_timer(self):
         """Обновление таймера"""
         if self.start_time:
-            self.game_time = (pygame.time.get_ticks() - self.start_time) // 1000
+            self.game_time = int(time.monotonic() - self.start_time)
     
     def get_time_string(self):
         """Получение времени в формате ММ:СС"""
@@ -400,15 +559,25 @@ class GameUI:
             return f"{minutes:02d}:{seconds:02d}"
         return "00:00"
     
+    def get_gradient(self, size, color1, color2):
+        """Вертикальный градиент нужного размера (строится один раз)"""
+        key = (size, tuple(color1[:3]), tuple(color2[:3]))
+        gradient = self.gradients.get(key)
+        if gradient is None:
+            width, height = size
+            column = pygame.Surface((1, height))
+            for y in range(height):
+                ratio = y / height
+                r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
+                g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
+                b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
+                column.set_at((0, y), (r, g, b))
+            gradient = self.gradients[key] = pygame.transform.scale(column, size)
+        return gradient
+    
     def draw_gradient_rect(self, screen, rect, color1, color2):
         """Отрисовка прямоугольника с градиентом"""
-        for y in range(rect.height):
-            ratio = y / rect.height
-            r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-            g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-            b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-            pygame.draw.line(screen, (r, g, b), 
-                           (rect.x, rect.y + y), (rect.x + rect.width, rect.y + y))
+        screen.blit(self.get_gradient(rect.size, color1, color2), rect.topleft)
     
     def draw_button(self, screen, rect, text, base_color, hover_color, text_color, hovered=False):
         """Отрисовка красивой кнопки"""
@@ -490,7 +659,7 @@ class GameUI:
     def draw_controls(self, screen):
         """Отрисовка панели управления"""
         controls_rect = pygame.Rect(50, 100, 300, 200)
-        self.draw_gradient_rect(controls_rect, controls_rect, (0, 0, 0, 150), (0, 34, 102, 150))
+        self.draw_gradient_rect(screen, controls_rect, (0, 0, 0, 150), (0, 34, 102, 150))
         pygame.draw.rect(screen, UI_COLORS['primary_blue'], controls_rect, 2, border_radius=10)
         
         y_offset = controls_rect.y + 20
@@ -503,6 +672,7 @@ class GameUI:
         # Инструкции
         instructions = [
             "🖱️ Мышь: Поворот камеры",
+            "🖱️ Тянуть наклейку: Поворот слоя",
             "R/L/U/D/F/B: Повороты граней",
             "Space: Перемешать",
             "Enter: Сброс"
@@ -545,6 +715,7 @@ class GameUI:
                     self.status_message = "✨ Кубик сброшен! Готов к новой игре!"
                 elif button_name == 'solve':
                     cube.reset()
+                    self.moves = 0
                     self.status_message = "🤖 Кубик автоматически решен!"
                 elif button_name == 'shop':
                     self.status_message = "🛒 Магазин скоро будет доступен!"
@@ -595,25 +766,157 @@ class GameUI:
         self.draw_buttons(screen, mouse_pos)
 
 
+class StartupProfiler:
+    """Замер времени запуска игры по фазам"""
+    
+    def __init__(self, start=STARTUP_START):
+        self.start = start
+        self.last = start
+        self.phases = []
+    
+    def mark(self, phase):
+        """Завершить фазу, начатую с предыдущей отметки"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last, now - self.start))
+        self.last = now
+    
+    def resume(self):
+        """Начать следующую фазу с текущего момента (пропустить ожидание игрока)"""
+        self.last = time.perf_counter()
+    
+    def add(self, phase, duration):
+        """Добавить фазу, измеренную отдельно (например, в фоновом потоке)"""
+        self.phases.append((phase, duration, None))
+    
+    def report(self):
+        """Отчет о запуске: длительность фазы и момент ее окончания, в мс"""
+        lines = ["⏱️ Запуск ProCube:"]
+        for phase, duration, at in self.phases:
+            line = f"  {phase:<16} {duration * 1000:8.1f} мс"
+            if at is not None:
+                line += f"  (с начала {at * 1000:.1f} мс)"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class FrameScheduler:
+    """Адаптивный темп кадров: полный FPS при движении, в покое - ожидание событий"""
+    
+    def __init__(self, mode=PACING_ADAPTIVE, fps=FPS):
+        self.mode = mode
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.start()
+    
+    def start(self):
+        """Начать отсчет кадров заново (перед игровым циклом, без экрана приветствия)"""
+        self.frames = 0
+        self.started = time.perf_counter()
+    
+    def next_events(self, active, idle_timeout=0):
+        """
+        Дождаться следующего кадра и вернуть накопившиеся события.
+        
+        Args:
+            active: Идет анимация или перетаскивание - нужен полный FPS
+            idle_timeout: Сколько мс ждать события в покое (0 - без ограничения)
+        """
+        self.frames += 1
+        if self.mode == PACING_ADAPTIVE:
+            if not active:
+                # В покое процесс спит до события или до обновления таймера
+                event = pygame.event.wait(idle_timeout)
+                events = [] if event.type == pygame.NOEVENT else [event]
+                events.extend(pygame.event.get())
+                # Частые события (движение мыши) не должны разгонять FPS выше лимита
+                self.clock.tick(self.fps)
+                return events
+            self.clock.tick(self.fps)
+        else:
+            # Замеры: без ограничения (vsync ограничивает сам flip)
+            self.clock.tick()
+        return pygame.event.get()
+    
+    def average_fps(self):
+        """Средний FPS с момента start()"""
+        elapsed = time.perf_counter() - self.started
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+
 class ProCubeGame:
     """Основной класс игры"""
     
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    def __init__(self, profiler=None):
+        self.profiler = profiler or StartupProfiler()
+        self.profiler.mark('import')
+        
+        # Инициализируем только нужные подсистемы SDL (без аудио и джойстиков)
+        pygame.display.init()
+        pygame.font.init()
+        self.profiler.mark('sdl_init')
+        
+        pacing = os.environ.get(FRAME_PACING_ENV, PACING_ADAPTIVE)
+        if pacing not in PACING_MODES:
+            pacing = PACING_ADAPTIVE
+        self.screen = self.create_window(pacing)
         pygame.display.set_caption("🎲 ProCube - Премиум 3D Кубик Рубика")
-        self.clock = pygame.time.Clock()
+        self.scheduler = FrameScheduler(pacing)
+        self.profiler.mark('window')
         
-        # Компоненты игры
-        self.cube = RubiksCube()
+        # Компоненты игры (кубик и сохранения грузятся в фоне)
         self.ui = GameUI()
+        self.cube = None
+        self.assets_time = 0.0
+        self.assets_error = None
+        self.assets_thread = threading.Thread(target=self.load_assets, daemon=True)
+        self.assets_thread.start()
         
         # Состояние игры
         self.running = True
         self.mouse_down = False
         self.last_mouse_pos = (0, 0)
+        self.drag_sticker = None
+        self.drag_start = (0, 0)
         
         # Показать приветственное сообщение
         self.show_welcome()
+        self.finish_loading()
+    
+    def create_window(self, pacing):
+        """Создание окна (с vsync, если он запрошен и поддерживается)"""
+        if pacing == PACING_VSYNC:
+            try:
+                return pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT),
+                                               pygame.SCALED, vsync=1)
+            except pygame.error:
+                pass
+        return pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    
+    def load_assets(self):
+        """Фоновая загрузка: кубик, прогресс игрока и градиенты интерфейса"""
+        started = time.perf_counter()
+        try:
+            self.cube = RubiksCube()
+            self.ui.load_progress()
+            self.ui.get_gradient((WINDOW_WIDTH, WINDOW_HEIGHT), *BACKGROUND_GRADIENT)
+            self.ui.get_gradient((WINDOW_WIDTH, 80), UI_COLORS['dark_blue'], UI_COLORS['primary_blue'])
+            self.ui.get_gradient((300, 400), (0, 0, 0), (0, 34, 102))
+            self.ui.get_gradient((300, 200), (0, 0, 0), (0, 34, 102))
+        except Exception as e:
+            # Ошибку из фонового потока пробрасываем в основном (finish_loading)
+            self.assets_error = e
+        self.assets_time = time.perf_counter() - started
+    
+    def finish_loading(self):
+        """Дождаться фоновой загрузки и вывести отчет о запуске"""
+        self.profiler.resume()
+        self.assets_thread.join()
+        if self.assets_error is not None:
+            raise self.assets_error
+        self.profiler.mark('assets_wait')
+        self.profiler.add('assets (фон)', self.assets_time)
+        if os.environ.get(STARTUP_REPORT_ENV):
+            print(self.profiler.report())
     
     def show_welcome(self):
         """Показать экран приветствия"""
@@ -641,8 +944,8 @@ class ProCubeGame:
         # Инструкции
         instructions = [
             "🎮 Управление:",
-            "",
             "🖱️ Зажмите мышь и двигайте для поворота камеры",
+            "🖱️ Потяните наклейку, чтобы повернуть ее слой",
             "⌨️ Клавиши R, L, U, D, F, B для поворотов граней",
             "🔄 Space - перемешать, Enter - сброс",
             "",
@@ -660,22 +963,23 @@ class ProCubeGame:
             y_offset += 25
         
         pygame.display.flip()
+        self.profiler.mark('first_frame')
         
         # Ждем нажатия клавиши
         waiting = True
         while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type in [pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN]:
-                    waiting = False
-    
-    def handle_events(self):
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type in [pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN]:
+                waiting = False
+    
+    def handle_events(self, events):
         """Обработка событий"""
         mouse_pos = pygame.mouse.get_pos()
         
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 self.ui.save_data()
                 self.running = False
@@ -683,24 +987,39 @@ class ProCubeGame:
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Левая кнопка мыши
                     if not self.ui.handle_button_click(mouse_pos, self.cube):
-                        self.mouse_down = True
-                        self.last_mouse_pos = mouse_pos
+                        # Наклейка под курсором - тянем слой, иначе вращаем камеру
+                        self.drag_sticker = self.cube.pick_sticker(mouse_pos)
+                        if self.drag_sticker:
+                            self.drag_start = mouse_pos
+                        else:
+                            self.mouse_down = True
+                            self.last_mouse_pos = mouse_pos
             
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     self.mouse_down = False
+                    self.drag_sticker = None
             
             elif event.type == pygame.MOUSEMOTION:
-                if self.mouse_down:
+                if self.drag_sticker:
+                    dx = mouse_pos[0] - self.drag_start[0]
+                    dy = mouse_pos[1] - self.drag_start[1]
+                    
+                    # Поворот слоя, когда мышь сдвинулась достаточно далеко. Пока идет
+                    # предыдущий поворот, наклейку не отпускаем - жест сработает позже
+                    if (math.hypot(dx, dy) >= DRAG_TURN_THRESHOLD
+                            and not self.cube.is_rotating):
+                        cubelet, face = self.drag_sticker
+                        if self.cube.drag_turn(cubelet, face, (dx, dy)):
+                            self.ui.update_moves()
+                            self.drag_sticker = None
+                
+                elif self.mouse_down:
                     dx = mouse_pos[0] - self.last_mouse_pos[0]
                     dy = mouse_pos[1] - self.last_mouse_pos[1]
                     
-                    # Поворот камеры
-                    self.cube.camera_rotation.y += dx * 0.01
-                    self.cube.camera_rotation.x += dy * 0.01
-                    
-                    # Ограничиваем вертикальный поворот
-                    self.cube.camera_rotation.x = max(-1.5, min(1.5, self.cube.camera_rotation.x))
+                    # Поворот камеры (вертикальный наклон ограничен самой камерой)
+                    self.cube.camera_rotation.orbit(dx * 0.01, dy * 0.01)
                     
                     self.last_mouse_pos = mouse_pos
             
@@ -737,26 +1056,32 @@ class ProCubeGame:
                         self.ui.game_time = 0
                         self.ui.status_message = "✨ Кубик сброшен!"
     
+    def is_animating(self):
+        """Идет поворот грани или перетаскивание камеры"""
+        return self.cube.is_rotating or self.mouse_down
+    
+    def idle_timeout(self):
+        """Сколько мс можно спать в покое: до следующей секунды таймера или без ограничения"""
+        if not self.ui.start_time:
+            return 0
+        elapsed = time.monotonic() - self.ui.start_time
+        return int((1 - elapsed % 1) * 1000) + 1
+    
     def update(self):
         """Обновление игры"""
         self.cube.update_rotation()
         
-        # Проверка на решение кубика
-        if self.cube.is_solved() and self.ui.moves > 0:
+        # Проверка на решение перемешанного кубика (после завершения анимации поворота)
+        if (self.cube.scrambled and not self.cube.is_rotating and self.ui.moves > 0
+                and self.cube.is_solved()):
             self.ui.on_cube_solved()
+            self.ui.moves = 0
+            self.cube.scrambled = False
     
     def draw(self):
         """Отрисовка игры"""
-        # Очистка экрана с градиентным фоном
-        self.screen.fill(UI_COLORS['background'])
-        
-        # Рисуем красивый фон
-        for y in range(WINDOW_HEIGHT):
-            ratio = y / WINDOW_HEIGHT
-            r = int(UI_COLORS['background'][0] * (1 - ratio * 0.5))
-            g = int(UI_COLORS['background'][1] * (1 - ratio * 0.3))
-            b = int(UI_COLORS['background'][2] + ratio * 30)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WINDOW_WIDTH, y))
+        # Очистка экрана градиентным фоном (поверхность строится один раз)
+        self.ui.draw_gradient_rect(self.screen, self.screen.get_rect(), *BACKGROUND_GRADIENT)
         
         # Отрисовка кубика
         self.cube.draw(self.screen)
@@ -769,12 +1094,14 @@ class ProCubeGame:
     
     def run(self):
         """Основной игровой цикл"""
+        self.scheduler.start()
         while self.running:
-            self.handle_events()
             self.update()
             self.draw()
-            self.clock.tick(FPS)
+            self.handle_events(self.scheduler.next_events(self.is_animating(), self.idle_timeout()))
         
+        if self.scheduler.mode != PACING_ADAPTIVE:
+            print(f"🎞️ Средний FPS ({self.scheduler.mode}): {self.scheduler.average_fps():.1f}")
         pygame.quit()
         sys.exit()
 
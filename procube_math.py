@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ProCube Math - 3D математика без лишних выделений памяти
+Версия: 2.0
+Автор: ProCube Team
+Описание: Векторы и матрицы со __slots__ и операциями на месте,
+кватернионы и камера с кешированной матрицей поворота.
+"""
+
+import math
+
+
+class Vector3:
+    """3D вектор для математических операций"""
+
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x=0, y=0, z=0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __add__(self, other):
+        return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, scalar):
+        return Vector3(self.x * scalar, self.y * scalar, self.z * scalar)
+
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        self.z *= scalar
+        return self
+
+    def __repr__(self):
+        return f"Vector3({self.x}, {self.y}, {self.z})"
+
+    def set(self, x, y, z):
+        """Присвоить координаты на месте"""
+        self.x = x
+        self.y = y
+        self.z = z
+        return self
+
+    def copy(self):
+        """Копия вектора"""
+        return Vector3(self.x, self.y, self.z)
+
+    def as_tuple(self):
+        """Координаты в виде кортежа"""
+        return self.x, self.y, self.z
+
+    def rotate_x(self, angle):
+        """Поворот вокруг оси X (новый вектор)"""
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        return Vector3(self.x, self.y * cos_a - self.z * sin_a, self.y * sin_a + self.z * cos_a)
+
+    def rotate_y(self, angle):
+        """Поворот вокруг оси Y (новый вектор)"""
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        return Vector3(self.x * cos_a + self.z * sin_a, self.y, -self.x * sin_a + self.z * cos_a)
+
+    def rotate_z(self, angle):
+        """Поворот вокруг оси Z (новый вектор)"""
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        return Vector3(self.x * cos_a - self.y * sin_a, self.x * sin_a + self.y * cos_a, self.z)
+
+
+class Matrix3:
+    """Матрица 3x3 (по строкам)"""
+
+    __slots__ = ('m00', 'm01', 'm02', 'm10', 'm11', 'm12', 'm20', 'm21', 'm22')
+
+    def __init__(self, m00=1, m01=0, m02=0, m10=0, m11=1, m12=0, m20=0, m21=0, m22=1):
+        self.m00, self.m01, self.m02 = m00, m01, m02
+        self.m10, self.m11, self.m12 = m10, m11, m12
+        self.m20, self.m21, self.m22 = m20, m21, m22
+
+    @classmethod
+    def rotation(cls, axis, angle):
+        """Матрица поворота вокруг оси 'x', 'y' или 'z'"""
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        if axis == 'x':
+            return cls(1, 0, 0, 0, cos_a, -sin_a, 0, sin_a, cos_a)
+        elif axis == 'y':
+            return cls(cos_a, 0, sin_a, 0, 1, 0, -sin_a, 0, cos_a)
+        elif axis == 'z':
+            return cls(cos_a, -sin_a, 0, sin_a, cos_a, 0, 0, 0, 1)
+        raise ValueError(f"Неизвестная ось: {axis}")
+
+    def rounded(self):
+        """Матрица с целыми элементами (для точных поворотов на 90 градусов)"""
+        return Matrix3(*(round(getattr(self, name)) for name in self.__slots__))
+
+    def apply(self, x, y, z):
+        """Умножение матрицы на точку, результат - кортеж"""
+        return (
+            self.m00 * x + self.m01 * y + self.m02 * z,
+            self.m10 * x + self.m11 * y + self.m12 * z,
+            self.m20 * x + self.m21 * y + self.m22 * z,
+        )
+
+    def transform(self, vec):
+        """Умножение матрицы на вектор на месте"""
+        x, y, z = vec.x, vec.y, vec.z
+        vec.x = self.m00 * x + self.m01 * y + self.m02 * z
+        vec.y = self.m10 * x + self.m11 * y + self.m12 * z
+        vec.z = self.m20 * x + self.m21 * y + self.m22 * z
+        return vec
+
+
+class Quaternion:
+    """Единичный кватернион для поворотов"""
+
+    __slots__ = ('w', 'x', 'y', 'z')
+
+    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @classmethod
+    def from_euler(cls, x, y, z):
+        """Поворот как в Vector3: сначала вокруг X, затем Y, затем Z"""
+        quat = cls().set_axis_angle(0, 0, 1, z)
+        step = cls()
+        quat.multiply(step.set_axis_angle(0, 1, 0, y))
+        quat.multiply(step.set_axis_angle(1, 0, 0, x))
+        return quat
+
+    def set_axis_angle(self, ax, ay, az, angle):
+        """Поворот на угол вокруг единичной оси (на месте)"""
+        half = angle / 2
+        sin_h = math.sin(half)
+        self.w = math.cos(half)
+        self.x = ax * sin_h
+        self.y = ay * sin_h
+        self.z = az * sin_h
+        return self
+
+    def multiply(self, other):
+        """self = self * other (поворот other выполняется первым)"""
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+        self.w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+        self.x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+        self.y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+        self.z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+        return self
+
+    def premultiply(self, other):
+        """self = other * self (поворот other выполняется последним)"""
+        w1, x1, y1, z1 = other.w, other.x, other.y, other.z
+        w2, x2, y2, z2 = self.w, self.x, self.y, self.z
+        self.w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+        self.x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+        self.y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+        self.z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+        return self
+
+    def normalize(self):
+        """Нормировка (убирает накопленную ошибку округления)"""
+        length = math.sqrt(self.w * self.w + self.x * self.x + self.y * self.y + self.z * self.z)
+        self.w /= length
+        self.x /= length
+        self.y /= length
+        self.z /= length
+        return self
+
+    def to_matrix(self, out):
+        """Запись матрицы поворота в готовую матрицу out"""
+        w, x, y, z = self.w, self.x, self.y, self.z
+        out.m00 = 1 - 2 * (y * y + z * z)
+        out.m01 = 2 * (x * y - w * z)
+        out.m02 = 2 * (x * z + w * y)
+        out.m10 = 2 * (x * y + w * z)
+        out.m11 = 1 - 2 * (x * x + z * z)
+        out.m12 = 2 * (y * z - w * x)
+        out.m20 = 2 * (x * z - w * y)
+        out.m21 = 2 * (y * z + w * x)
+        out.m22 = 1 - 2 * (x * x + y * y)
+        return out
+
+
+class Camera:
+    """Камера-кватернион: матрица поворота кешируется и пересчитывается только после поворота"""
+
+    __slots__ = ('orientation', 'pitch', 'pitch_limit', '_matrix', '_dirty', '_step')
+
+    def __init__(self, pitch=0.0, yaw=0.0, roll=0.0, pitch_limit=1.5):
+        self.orientation = Quaternion.from_euler(pitch, yaw, roll)
+        self.pitch = pitch
+        self.pitch_limit = pitch_limit
+        self._matrix = Matrix3()
+        self._dirty = True
+        self._step = Quaternion()
+
+    def orbit(self, yaw, pitch):
+        """
+        Поворот камеры мышью.
+
+        Args:
+            yaw: Поворот вокруг вертикальной оси мира, радианы
+            pitch: Наклон вокруг оси X камеры, радианы (с ограничением)
+        """
+        new_pitch = max(-self.pitch_limit, min(self.pitch_limit, self.pitch + pitch))
+        pitch = new_pitch - self.pitch
+        self.pitch = new_pitch
+        if not yaw and not pitch:
+            return
+        if yaw:
+            self.orientation.premultiply(self._step.set_axis_angle(0, 1, 0, yaw))
+        if pitch:
+            self.orientation.multiply(self._step.set_axis_angle(1, 0, 0, pitch))
+        self.orientation.normalize()
+        self._dirty = True
+
+    @property
+    def matrix(self):
+        """Матрица поворота камеры (из кеша, если камера не двигалась)"""
+        if self._dirty:
+            self.orientation.to_matrix(self._matrix)
+            self._dirty = False
+        return self._matrix
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ProCube Race - Локальный сервер гонок на asyncio
+Версия: 2.0
+Автор: ProCube Team
+Описание: Все клиенты собирают одну и ту же скрамбл-позицию по зерну.
+Клиенты присылают только новые ходы (дельты) в компактном бинарном виде,
+сервер проверяет сборку на движке кубика и рассылает текущую таблицу.
+"""
+
+import argparse
+import asyncio
+import random
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from procube_game import RubiksCube, FACES, FACE_NORMALS, COLORS
+
+# Настройки сервера
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7777
+SCRAMBLE_LENGTH = 25
+RACE_DURATION = 120.0        # секунд на одну гонку
+STANDINGS_INTERVAL = 0.5     # секунд между рассылками таблицы
+STANDINGS_TOP = 10           # сколько игроков попадает в таблицу
+MAX_MOVES = 1000             # ходов за гонку, больше - клиент отключается
+MAX_WRITE_BUFFER = 64 * 1024  # медленным клиентам таблица не отправляется
+MAX_NAME_LENGTH = 32
+
+# Типы сообщений: клиент -> сервер
+MSG_HELLO = 0x01      # payload: имя игрока (utf-8)
+MSG_MOVES = 0x02      # payload: race_id, offset, байты ходов
+MSG_DONE = 0x03       # payload: race_id
+
+# Типы сообщений: сервер -> клиент
+MSG_SCRAMBLE = 0x10   # payload: race_id, seed, байты ходов скрамбла
+MSG_STANDINGS = 0x11  # payload: race_id, игроков, записей, записи
+MSG_RESULT = 0x12     # payload: ok, race_id, время в мс, число ходов
+
+# Бинарные форматы (сетевой порядок байт)
+HEADER = struct.Struct('!BH')             # тип, длина payload
+RACE_SEED = struct.Struct('!II')          # race_id, seed
+MOVES_HEADER = struct.Struct('!II')       # race_id, offset
+RACE_ID = struct.Struct('!I')
+RESULT = struct.Struct('!BIIH')           # ok, race_id, time_ms, moves
+STANDINGS_HEADER = struct.Struct('!IHH')  # race_id, players, entries
+STANDING_ENTRY = struct.Struct('!IBIHB')  # player_id, solved, time_ms, moves, name_len
+
+# Кодирование хода в один байт: младшие 3 бита - грань, бит 3 - против часовой
+CCW_FLAG = 0x08
+FACE_CODES = {face: code for code, face in enumerate(FACES)}
+
+
+def encode_moves(moves: List[Tuple[str, bool]]) -> bytes:
+    """Кодирование списка ходов в байты (по байту на ход)"""
+    return bytes(FACE_CODES[face] | (0 if clockwise else CCW_FLAG) for face, clockwise in moves)
+
+
+def decode_moves(data: bytes) -> List[Tuple[str, bool]]:
+    """
+    Декодирование байтов в список ходов.
+
+    Raises:
+        ValueError: Если байт не является допустимым ходом
+    """
+    moves = []
+    for byte in data:
+        code = byte & ~CCW_FLAG
+        if code >= len(FACES):
+            raise ValueError(f"Недопустимый ход: {byte:#04x}")
+        moves.append((FACES[code], not byte & CCW_FLAG))
+    return moves
+
+
+def invert_moves(moves: List[Tuple[str, bool]]) -> List[Tuple[str, bool]]:
+    """Обратная последовательность ходов (отменяет исходную)"""
+    return [(face, not clockwise) for face, clockwise in reversed(moves)]
+
+
+def pack_message(msg_type: int, payload: bytes = b'') -> bytes:
+    """Упаковка сообщения: заголовок + payload"""
+    return HEADER.pack(msg_type, len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Чтение одного сообщения из потока"""
+    header = await reader.readexactly(HEADER.size)
+    msg_type, length = HEADER.unpack(header)
+    payload = await reader.readexactly(length) if length else b''
+    return msg_type, payload
+
+
+def raise_fd_limit():
+    """Поднять лимит открытых файлов до максимума (нужно для тысяч сокетов)"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def self_test(rounds=20) -> bool:
+    """
+    Быстрая проверка движка и протокола, на которые опирается сервер:
+    скрамбл и обратный скрамбл собирают кубик, лишний ход - нет,
+    анимированные повороты совпадают с мгновенными, ходы переживают кодирование.
+    """
+    failures = []
+
+    def check(ok, message):
+        if not ok:
+            failures.append(message)
+
+    def stickers_outside(cube):
+        """Наклейки повернулись вместе с кубиками: ни одна сторона снаружи не черная"""
+        for face, (nx, ny, nz) in FACE_NORMALS.items():
+            for cubelet in cube.cubelets:
+                pos = cubelet.current_pos
+                if (pos.x * nx + pos.y * ny + pos.z * nz > 0
+                        and cubelet.colors.get(face, COLORS['black']) == COLORS['black']):
+                    return False
+        return True
+
+    all_moves = [(face, clockwise) for face in FACES for clockwise in (True, False)]
+    check(decode_moves(encode_moves(all_moves)) == all_moves, "кодирование всех ходов")
+    try:
+        decode_moves(bytes([len(FACES)]))
+        check(False, "недопустимый байт хода не отклонен")
+    except ValueError:
+        pass
+
+    for seed in range(rounds):
+        cube = RubiksCube()
+        check(cube.is_solved() and not cube.scrambled, f"#{seed}: новый кубик")
+        scramble = cube.shuffle(SCRAMBLE_LENGTH, random.Random(seed))
+        check(cube.scrambled, f"#{seed}: нет флага перемешивания")
+        check(not cube.is_solved(), f"#{seed}: скрамбл не перемешал кубик")
+        check(stickers_outside(cube), f"#{seed}: наклейки не повернулись вместе с кубиками")
+        check(decode_moves(encode_moves(scramble)) == scramble, f"#{seed}: кодирование скрамбла")
+
+        # Тот же скрамбл через анимацию, как в игре
+        animated = RubiksCube()
+        for face, clockwise in scramble:
+            animated.rotate_face(face, clockwise)
+            while animated.is_rotating:
+                animated.update_rotation()
+        for face, clockwise in invert_moves(scramble):
+            cube.apply_move(face, clockwise)
+            animated.apply_move(face, clockwise)
+        check(cube.is_solved(), f"#{seed}: обратный скрамбл не собрал кубик")
+        check(animated.is_solved(), f"#{seed}: анимированные повороты расходятся с мгновенными")
+
+        face, clockwise = scramble[0]
+        cube.apply_move(face, clockwise)
+        check(not cube.is_solved(), f"#{seed}: лишний ход {face} не сломал сборку")
+        cube.reset()
+        check(cube.is_solved() and not cube.scrambled, f"#{seed}: сброс")
+
+    for message in failures:
+        print(f"❌ {message}")
+    print(f"{'✅' if not failures else '❌'} Самопроверка: {rounds} скрамблов, ошибок: {len(failures)}")
+    return not failures
+
+
+class Player:
+    """Участник гонки на стороне сервера"""
+
+    def __init__(self, player_id, name, writer):
+        self.player_id = player_id
+        self.name = name
+        self.writer = writer
+        self.moves = 0
+        self.cube: Optional[RubiksCube] = None
+        self.finish_ms = None
+
+    def reset(self):
+        """Сброс прогресса перед новой гонкой"""
+        self.moves = 0
+        self.cube = None
+        self.finish_ms = None
+
+    def send(self, message):
+        """Отправка сообщения, если соединение еще открыто"""
+        if not self.writer.is_closing():
+            self.writer.write(message)
+
+
+class RaceServer:
+    """Сервер гонок: скрамблы, прием ходов, проверка и таблица результатов"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, scramble_length=SCRAMBLE_LENGTH,
+                 race_duration=RACE_DURATION, seed=None):
+        self.host = host
+        self.port = port
+        self.scramble_length = scramble_length
+        self.race_duration = race_duration
+        self.rng = random.Random(seed)
+
+        self.players: Dict[int, Player] = {}
+        self.next_player_id = 1
+        self.race_id = 0
+        self.race_seed = 0
+        self.race_started = 0.0
+        self.scramble: List[Tuple[str, bool]] = []
+        self.scramble_cube = RubiksCube()
+        self.scramble_message = b''
+        self.standings_dirty = False
+        self.server: Optional[asyncio.AbstractServer] = None
+
+        self.new_race()
+
+    def new_race(self):
+        """Начать новую гонку и разослать скрамбл всем игрокам"""
+        self.race_id += 1
+        self.race_seed = self.rng.getrandbits(32)
+        self.race_started = time.monotonic()
+        self.scramble_cube = RubiksCube()
+        self.scramble = self.scramble_cube.shuffle(self.scramble_length,
+                                                   random.Random(self.race_seed))
+        self.scramble_message = pack_message(
+            MSG_SCRAMBLE,
+            RACE_SEED.pack(self.race_id, self.race_seed) + encode_moves(self.scramble))
+
+        for player in self.players.values():
+            player.reset()
+            player.send(self.scramble_message)
+        self.standings_dirty = True
+
+    def build_standings(self) -> bytes:
+        """Таблица: только собравшие, по времени, затем по числу ходов"""
+        ranked = sorted(
+            (p for p in self.players.values() if p.finish_ms is not None),
+            key=lambda p: (p.finish_ms, p.moves))
+        entries = []
+        for player in ranked[:STANDINGS_TOP]:
+            name = player.name.encode('utf-8')
+            entries.append(STANDING_ENTRY.pack(
+                player.player_id, player.finish_ms is not None, player.finish_ms or 0,
+                min(player.moves, 0xFFFF), len(name)) + name)
+        payload = STANDINGS_HEADER.pack(
+            self.race_id, min(len(self.players), 0xFFFF), len(entries)) + b''.join(entries)
+        return pack_message(MSG_STANDINGS, payload)
+
+    def handle_moves(self, player, payload):
+        """
+        Прием дельты ходов: ходы сразу применяются к кубику игрока.
+
+        Raises:
+            ValueError: Если смещение не совпадает с уже принятыми ходами
+                или игрок превысил MAX_MOVES
+        """
+        race_id, offset = MOVES_HEADER.unpack_from(payload)
+        if race_id != self.race_id or player.finish_ms is not None:
+            return  # ходы от прошлой гонки или после финиша
+        if offset != player.moves:
+            raise ValueError(f"Рассинхронизация ходов: {offset} != {player.moves}")
+        moves = decode_moves(payload[MOVES_HEADER.size:])
+        if player.moves + len(moves) > MAX_MOVES:
+            raise ValueError(f"Слишком много ходов: {player.moves + len(moves)}")
+
+        if player.cube is None:
+            player.cube = RubiksCube()
+            player.cube.load_state(self.scramble_cube)
+        for face, clockwise in moves:
+            player.cube.apply_move(face, clockwise)
+        player.moves += len(moves)
+
+    def handle_done(self, player, payload):
+        """
+        Заявка на сборку: кубик игрока уже в текущем состоянии, проверка дешевая.
+        Время считается от начала гонки, в том числе для подключившихся позже.
+        """
+        race_id, = RACE_ID.unpack_from(payload)
+        ok = False
+        if race_id == self.race_id:
+            if player.finish_ms is not None:
+                ok = True
+            elif player.cube is not None and player.cube.is_solved():
+                player.finish_ms = int((time.monotonic() - self.race_started) * 1000)
+                self.standings_dirty = True
+                ok = True
+        player.send(pack_message(MSG_RESULT, RESULT.pack(
+            ok, race_id, player.finish_ms or 0, min(player.moves, 0xFFFF))))
+
+        if ok:
+            self.check_race_finished()
+
+    def check_race_finished(self):
+        """Все оставшиеся игроки собрали - сразу начинаем следующую гонку"""
+        if self.players and all(p.finish_ms is not None for p in self.players.values()):
+            self.new_race()
+
+    async def handle_client(self, reader, writer):
+        """Обработка одного подключения"""
+        player = None
+        try:
+            msg_type, payload = await read_message(reader)
+            if msg_type != MSG_HELLO:
+                return
+            name = payload[:MAX_NAME_LENGTH].decode('utf-8', 'replace')
+            player = Player(self.next_player_id, name, writer)
+            self.next_player_id += 1
+            self.players[player.player_id] = player
+            player.send(self.scramble_message)
+            self.standings_dirty = True
+
+            while True:
+                msg_type, payload = await read_message(reader)
+                if msg_type == MSG_MOVES:
+                    self.handle_moves(player, payload)
+                elif msg_type == MSG_DONE:
+                    self.handle_done(player, payload)
+                else:
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, struct.error):
+            pass
+        finally:
+            if player is not None:
+                del self.players[player.player_id]
+                self.standings_dirty = True
+                self.check_race_finished()
+            writer.close()
+
+    async def broadcast_standings(self):
+        """Периодическая рассылка таблицы, только если что-то изменилось"""
+        while True:
+            await asyncio.sleep(STANDINGS_INTERVAL)
+            if not self.standings_dirty:
+                continue
+            self.standings_dirty = False
+            message = self.build_standings()
+            for player in self.players.values():
+                if player.writer.transport.get_write_buffer_size() < MAX_WRITE_BUFFER:
+                    player.send(message)
+
+    async def race_timer(self):
+        """Смена гонки по истечении времени"""
+        while True:
+            await asyncio.sleep(1)
+            if time.monotonic() - self.race_started >= self.race_duration:
+                self.new_race()
+
+    async def serve(self):
+        """Запуск сервера до остановки"""
+        self.server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, backlog=4096)
+        tasks = [asyncio.create_task(self.broadcast_standings()),
+                 asyncio.create_task(self.race_timer())]
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def main():
+    """Запуск сервера гонок из командной строки"""
+    parser = argparse.ArgumentParser(description="ProCube - локальный сервер гонок")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--scramble-length', type=int, default=SCRAMBLE_LENGTH)
+    parser.add_argument('--race-duration', type=float, default=RACE_DURATION,
+                        help="секунд на одну гонку")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="зерно для последовательности скрамблов")
+    parser.add_argument('--self-test', action='store_true',
+                        help="проверить движок кубика и протокол и выйти")
+    args = parser.parse_args()
+
+    if args.self_test:
+        sys.exit(0 if self_test() else 1)
+
+    raise_fd_limit()
+    server = RaceServer(args.host, args.port, args.scramble_length, args.race_duration, args.seed)
+    print(f"🏁 Сервер гонок ProCube: {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
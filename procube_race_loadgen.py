@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ProCube Race Load Generator - Нагрузочный тест сервера гонок
+Версия: 2.0
+Автор: ProCube Team
+Описание: Запускает тысячи симулированных клиентов в одном процессе.
+Каждый клиент получает скрамбл, присылает решение пачками ходов
+и ждет проверки сервером. В конце печатается сводка.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import List, Optional
+
+from procube_race import (
+    DEFAULT_HOST, DEFAULT_PORT, MSG_HELLO, MSG_MOVES, MSG_DONE, MSG_SCRAMBLE,
+    MSG_STANDINGS, MSG_RESULT, RACE_SEED, MOVES_HEADER, RACE_ID, RESULT,
+    encode_moves, decode_moves, invert_moves, pack_message, read_message, raise_fd_limit,
+)
+from procube_game import FACES
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'procube_race.py')
+
+
+class LoadStats:
+    """Сводная статистика нагрузочного теста"""
+
+    def __init__(self):
+        self.connected = 0
+        self.failed_connects = 0
+        self.disconnected = 0
+        self.solves_ok = 0
+        self.solves_rejected = 0
+        self.moves_sent = 0
+        self.standings_received = 0
+        self.result_latencies: List[float] = []
+
+    def percentile(self, q):
+        """Перцентиль задержки проверки сборки в миллисекундах"""
+        if not self.result_latencies:
+            return 0.0
+        values = sorted(self.result_latencies)
+        return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+
+async def run_client(index, args, stats, connect_limit, stop):
+    """Один симулированный игрок: решает одну гонку и остается на связи до конца теста"""
+    rng = random.Random(index)
+    try:
+        async with connect_limit:
+            reader, writer = await asyncio.open_connection(args.host, args.port)
+    except OSError:
+        stats.failed_connects += 1
+        return
+    stats.connected += 1
+
+    scramble_ready = asyncio.Event()
+    result_ready = asyncio.Event()
+    closed = asyncio.Event()
+    race = {'id': 0, 'scramble': [], 'ok': False}
+
+    async def receive():
+        try:
+            while True:
+                msg_type, payload = await read_message(reader)
+                if msg_type == MSG_SCRAMBLE:
+                    race['id'], _seed = RACE_SEED.unpack_from(payload)
+                    race['scramble'] = decode_moves(payload[RACE_SEED.size:])
+                    scramble_ready.set()
+                elif msg_type == MSG_STANDINGS:
+                    stats.standings_received += 1
+                elif msg_type == MSG_RESULT:
+                    race['ok'] = bool(RESULT.unpack_from(payload)[0])
+                    result_ready.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # Будим всех ожидающих: соединение закрыто, ответов больше не будет
+            closed.set()
+            scramble_ready.set()
+            result_ready.set()
+
+    async def wait_for(event):
+        """Ожидание события или остановки теста; True, если можно продолжать"""
+        waiters = {asyncio.ensure_future(event.wait()), asyncio.ensure_future(stop.wait())}
+        _done, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in pending:
+            waiter.cancel()
+        return not stop.is_set() and not closed.is_set()
+
+    receiver = asyncio.create_task(receive())
+    solved = False
+    try:
+        writer.write(pack_message(MSG_HELLO, f"bot-{index}".encode('utf-8')))
+        while not solved:
+            if not await wait_for(scramble_ready):
+                break
+            scramble_ready.clear()
+            race_id = race['id']
+
+            # Решение = обратный скрамбл с лишними парами ходов X X'
+            solution = invert_moves(race['scramble'])
+            for _ in range(rng.randint(0, args.max_padding)):
+                face, clockwise = rng.choice(FACES), rng.random() < 0.5
+                position = rng.randint(0, len(solution))
+                solution[position:position] = [(face, clockwise), (face, not clockwise)]
+
+            offset = 0
+            while (offset < len(solution) and not scramble_ready.is_set()
+                   and not stop.is_set()):
+                delta = encode_moves(solution[offset:offset + args.moves_per_packet])
+                writer.write(pack_message(MSG_MOVES, MOVES_HEADER.pack(race_id, offset) + delta))
+                offset += len(delta)
+                stats.moves_sent += len(delta)
+                await writer.drain()
+                await asyncio.sleep(rng.uniform(0, 2 * args.move_delay))
+            if stop.is_set() or closed.is_set():
+                break
+            if scramble_ready.is_set():
+                continue  # сервер начал новую гонку - решаем заново
+
+            result_ready.clear()
+            sent_at = time.perf_counter()
+            writer.write(pack_message(MSG_DONE, RACE_ID.pack(race_id)))
+            await writer.drain()
+            if not await wait_for(result_ready):
+                break
+            stats.result_latencies.append(time.perf_counter() - sent_at)
+            if race['ok']:
+                stats.solves_ok += 1
+                solved = True
+            else:
+                stats.solves_rejected += 1
+
+        await wait_for(closed)
+    except ConnectionError:
+        closed.set()
+    finally:
+        if closed.is_set() and not stop.is_set() and not solved:
+            stats.disconnected += 1
+        receiver.cancel()
+        writer.close()
+
+
+async def wait_for_server(host, port, timeout=10.0):
+    """Ожидание, пока сервер начнет принимать подключения"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _reader, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_load(args):
+    """Запуск всех клиентов и печать сводки"""
+    server_process: Optional[asyncio.subprocess.Process] = None
+    if args.spawn_server:
+        server_process = await asyncio.create_subprocess_exec(
+            sys.executable, SERVER_SCRIPT, '--host', args.host, '--port', str(args.port),
+            '--race-duration', str(args.race_duration))
+        await wait_for_server(args.host, args.port)
+
+    stats = LoadStats()
+    stop = asyncio.Event()
+    connect_limit = asyncio.Semaphore(args.connect_concurrency)
+    started = time.perf_counter()
+    clients = [asyncio.create_task(run_client(i, args, stats, connect_limit, stop))
+               for i in range(args.clients)]
+
+    # Ждем, пока все подключившиеся соберут кубик (или истечет время)
+    deadline = started + args.timeout
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(0.5)
+        if stats.solves_ok + stats.failed_connects + stats.disconnected >= args.clients:
+            break
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*clients, return_exceptions=True)
+
+    if server_process is not None and server_process.returncode is None:
+        server_process.terminate()
+        await server_process.wait()
+
+    print(f"👥 Клиентов: {stats.connected}/{args.clients} (ошибок подключения: "
+          f"{stats.failed_connects}, обрывов связи: {stats.disconnected})")
+    print(f"✅ Сборок принято: {stats.solves_ok}, отклонено: {stats.solves_rejected}")
+    print(f"🔁 Ходов отправлено: {stats.moves_sent} ({stats.moves_sent / elapsed:.0f}/с)")
+    print(f"📊 Таблиц получено: {stats.standings_received}")
+    print(f"⏱️ Проверка сборки: p50 {stats.percentile(0.5):.1f} мс, "
+          f"p99 {stats.percentile(0.99):.1f} мс")
+    print(f"⌛ Время теста: {elapsed:.1f} с")
+    return stats.solves_ok == args.clients
+
+
+def main():
+    """Запуск нагрузочного теста из командной строки"""
+    parser = argparse.ArgumentParser(description="ProCube - нагрузочный тест сервера гонок")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--clients', type=int, default=2000)
+    parser.add_argument('--moves-per-packet', type=int, default=4)
+    parser.add_argument('--move-delay', type=float, default=0.05,
+                        help="средняя пауза между пачками ходов, секунд")
+    parser.add_argument('--max-padding', type=int, default=5,
+                        help="максимум лишних пар ходов X X' в решении")
+    parser.add_argument('--connect-concurrency', type=int, default=256)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--spawn-server', action='store_true',
+                        help="запустить сервер в отдельном процессе")
+    parser.add_argument('--race-duration', type=float, default=300.0,
+                        help="длительность гонки для запускаемого сервера")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    ok = asyncio.run(run_load(args))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
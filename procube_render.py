@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ProCube Render - Офскрин-рендер записанных сборок
+Версия: 2.0
+Автор: ProCube Team
+Описание: Рисует повторы сборок через RubiksCube.draw на поверхности в памяти
+(SDL dummy video, без окна) и сохраняет кадры в PNG или отдает их
+кодировщику видео через pipe. Повторы рендерятся параллельно в пуле процессов.
+"""
+
+import os
+
+# Окно не нужно: рендерим только в память
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import argparse
+import json
+import math
+import shutil
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+
+import pygame
+
+from procube_game import (
+    RubiksCube, GameUI, FACES, BACKGROUND_GRADIENT, WINDOW_WIDTH, WINDOW_HEIGHT, FPS,
+)
+from procube_math import Camera
+
+# Настройки рендера
+HOLD_FRAMES = FPS // 2        # кадров паузы до и после сборки
+MAX_TASKS_PER_WORKER = 20     # после стольких повторов процесс пула перезапускается
+DEFAULT_ENCODER = 'ffmpeg'
+OUTPUT_FORMATS = ('png', 'video')
+
+# Рендерер процесса пула: поверхность и шрифты создаются один раз на процесс
+_renderer = None
+
+
+def parse_moves(notation: str) -> List[Tuple[str, bool]]:
+    """
+    Разбор записи ходов вида "R U' F2" в список (грань, по часовой).
+
+    Raises:
+        ValueError: Если ход записан неверно
+    """
+    moves = []
+    for token in notation.split():
+        face, suffix = token[0], token[1:]
+        if face not in FACES or suffix not in ('', "'", '2'):
+            raise ValueError(f"Неверный ход: {token}")
+        clockwise = suffix != "'"
+        moves.extend([(face, clockwise)] * (2 if suffix == '2' else 1))
+    return moves
+
+
+def load_replay(path: str) -> Dict:
+    """
+    Загрузка записи сборки из JSON:
+    {"scramble": "R U ...", "moves": "U' R' ...", "camera": [0.3, 0.3, 0]}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {
+        'name': os.path.splitext(os.path.basename(path))[0],
+        'scramble': parse_moves(data.get('scramble', '')),
+        'moves': parse_moves(data.get('moves', '')),
+        'camera': data.get('camera'),
+    }
+
+
+def raw_pixel_format(surface) -> str:
+    """Формат сырых пикселей поверхности в обозначениях ffmpeg (например, 'bgr0')"""
+    channels = ['0'] * surface.get_bytesize()
+    for name, mask, shift in zip('rgb', surface.get_masks(), surface.get_shifts()):
+        if mask:
+            channels[shift // 8] = name
+    if sys.byteorder == 'big':
+        channels.reverse()
+    return ''.join(channels)
+
+
+class ReplayRenderer:
+    """Рендер повтора в одну переиспользуемую поверхность"""
+
+    def __init__(self, size=(WINDOW_WIDTH, WINDOW_HEIGHT)):
+        self.surface = pygame.Surface(size, 0, 32)
+        self.ui = GameUI()
+
+    def draw(self, cube):
+        """Отрисовка кадра: фон и кубик"""
+        self.ui.draw_gradient_rect(self.surface, self.surface.get_rect(), *BACKGROUND_GRADIENT)
+        cube.draw(self.surface)
+
+    def frames(self, replay):
+        """
+        Различающиеся кадры повтора. После каждого шага self.surface содержит новый
+        кадр (сами кадры не копируются), шаг возвращает его длительность в кадрах видео.
+        RubiksCube.draw не рисует промежуточные углы поворота, поэтому на ход - один
+        кадр длительностью в анимацию хода. Возвращает кубик в конечном состоянии.
+        """
+        cube = RubiksCube()
+        if replay.get('camera'):
+            cube.camera_rotation = Camera(*replay['camera'])
+        for face, clockwise in replay['scramble']:
+            cube.apply_move(face, clockwise)
+        move_frames = math.ceil(90 / cube.animation_speed)
+
+        self.draw(cube)
+        repeat = HOLD_FRAMES
+        for face, clockwise in replay['moves']:
+            yield repeat
+            cube.apply_move(face, clockwise)
+            self.draw(cube)
+            repeat = move_frames
+        yield repeat + HOLD_FRAMES
+        return cube
+
+
+def get_renderer():
+    """Рендерер текущего процесса (создается при первом обращении)"""
+    global _renderer
+    if _renderer is None:
+        _renderer = ReplayRenderer()
+    return _renderer
+
+
+def encoder_command(encoder, surface, fps, output):
+    """Команда кодировщика, читающего сырые кадры из stdin"""
+    width, height = surface.get_size()
+    return [
+        encoder, '-loglevel', 'error', '-y',
+        '-f', 'rawvideo', '-pix_fmt', raw_pixel_format(surface),
+        '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+        '-pix_fmt', 'yuv420p', output,
+    ]
+
+
+def render_job(job):
+    """Рендер одного повтора, ошибки не перехватываются"""
+    path, out_dir, output_format, fps, thumbnail, encoder = job
+    started = time.perf_counter()
+    replay = load_replay(path)
+    renderer = get_renderer()
+    frames = renderer.frames(replay)
+    count = 0
+    cube = None
+
+    if output_format == 'png':
+        frames_dir = os.path.join(out_dir, replay['name'])
+        os.makedirs(frames_dir, exist_ok=True)
+        try:
+            while True:
+                next(frames)
+                pygame.image.save(renderer.surface, os.path.join(frames_dir, f"{count:05d}.png"))
+                count += 1
+        except StopIteration as stop:
+            cube = stop.value
+    else:
+        output = os.path.join(out_dir, f"{replay['name']}.mp4")
+        process = subprocess.Popen(encoder_command(encoder, renderer.surface, fps, output),
+                                   stdin=subprocess.PIPE, preexec_fn=encoder_preexec())
+        try:
+            while True:
+                repeat = next(frames)
+                # Буфер поверхности уходит в pipe напрямую, без копии кадра;
+                # кадр повторяется только ради длительности в видео
+                view = renderer.surface.get_view('1')
+                for _ in range(repeat):
+                    process.stdin.write(view)
+                del view
+                count += repeat
+        except StopIteration as stop:
+            cube = stop.value
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            process.wait()
+        if process.returncode:
+            raise RuntimeError(f"Кодировщик завершился с кодом {process.returncode}: {output}")
+
+    if thumbnail:
+        pygame.image.save(renderer.surface, os.path.join(out_dir, f"{replay['name']}_thumb.png"))
+
+    return replay['name'], count, time.perf_counter() - started, cube.is_solved()
+
+
+def render_replay(job):
+    """
+    Рендер одного повтора в процессе пула. Ошибка возвращается как результат,
+    чтобы один плохой повтор не останавливал весь пакет.
+    """
+    try:
+        return render_job(job) + (None,)
+    except Exception as e:
+        name = os.path.splitext(os.path.basename(job[0]))[0]
+        return name, 0, 0.0, False, f"{type(e).__name__}: {e}"
+
+
+def lift_memory_limit():
+    """Снять лимит памяти процесса пула (для кодировщика, он наследует лимит)"""
+    import resource
+    _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+
+
+def encoder_preexec():
+    """preexec_fn для кодировщика: лимит памяти действует только на сам рендер"""
+    if os.name != 'posix':
+        return None
+    return lift_memory_limit
+
+
+def limit_memory(max_memory_mb):
+    """Ограничение памяти процесса пула"""
+    try:
+        import resource
+    except ImportError:
+        return
+    # Ограничиваем только мягкий лимит, чтобы кодировщик мог вернуть жесткий
+    _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = max_memory_mb * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def init_worker(max_memory_mb):
+    """Инициализация процесса пула: лимит памяти, если задан, и рендерер"""
+    if max_memory_mb:
+        limit_memory(max_memory_mb)
+    get_renderer()
+
+
+def main():
+    """Пакетный рендер повторов из командной строки"""
+    parser = argparse.ArgumentParser(description="ProCube - офскрин-рендер записанных сборок")
+    parser.add_argument('replays', nargs='+', help="JSON-файлы с записями сборок")
+    parser.add_argument('--out', default='renders', help="папка для результатов")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='png')
+    parser.add_argument('--fps', type=int, default=FPS)
+    parser.add_argument('--thumbnail', action='store_true',
+                        help="сохранить последний кадр как миниатюру")
+    parser.add_argument('--encoder', default=DEFAULT_ENCODER, help="путь к ffmpeg")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-memory-mb', type=int, default=0,
+                        help="лимит памяти на процесс пула, без кодировщика (0 - без лимита)")
+    args = parser.parse_args()
+
+    if args.format == 'video' and not shutil.which(args.encoder):
+        parser.error(f"Кодировщик не найден: {args.encoder}")
+    os.makedirs(args.out, exist_ok=True)
+
+    jobs = [(path, args.out, args.format, args.fps, args.thumbnail, args.encoder)
+            for path in args.replays]
+    started = time.perf_counter()
+    failed = 0
+    with Pool(args.workers, init_worker, (args.max_memory_mb,),
+              maxtasksperchild=MAX_TASKS_PER_WORKER) as pool:
+        for name, count, seconds, solved, error in pool.imap_unordered(render_replay, jobs):
+            if error:
+                failed += 1
+                print(f"💥 {name}: ошибка рендера - {error}")
+                continue
+            status = "✅" if solved else "❌"
+            print(f"{status} {name}: {count} кадров за {seconds:.1f} с")
+    print(f"🎬 Готово: {len(jobs) - failed} из {len(jobs)} повторов "
+          f"за {time.perf_counter() - started:.1f} с")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()